@@ -6,18 +6,44 @@ __status__ = "test"
 import errno
 import argparse
 import csv
+import functools
+import io
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+import numpy as np
+import pyproj
 import rasterio
+import rasterio.transform
 import rasterio.warp
+from rasterio.enums import Resampling
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
 from tqdm import tqdm
 
+try:
+    import numba
+except ImportError:
+    numba = None  # Optional; the LUT fallback is used when Numba is unavailable
+
 # Define lowest and highest coverage levels
 MIN_COVERAGE = -108
 MAX_COVERAGE = -80
 NO_COVERAGE = 0
 
-# CSV processing
-BATCH_SIZE = 20
+# CSV processing; large batches amortize per-batch Python and numpy overhead
+BATCH_SIZE = 65536
+
+# Read and write the CSV files through large buffers to cut down on syscalls
+IO_BUFFER_BYTES = 1 << 20
+
+# Load the raster fully into memory when it fits; fall back to windowed reads
+MAX_RASTER_BYTES = 1 << 30
+
+# Decoded raster blocks kept in memory on the windowed-read fallback path
+BLOCK_CACHE_SIZE = 64
 
 # Define RGB to dBm mapping
 RGB_TO_DBM = {
@@ -29,49 +55,146 @@ RGB_TO_DBM = {
 
 RGB_NO_COVERAGE = (247, 247, 247)
 
-def transform_coordinates(coordinates, src_crs):
+# Packed-RGB value of pure white, the no-coverage / undefined marker
+WHITE = np.uint32(0xFFFFFF)
+
+# The palette is constant, so sort its dBm values and pair each one with the
+# next higher coverage bucket once instead of per row
+_SORTED_DBM = sorted(set(RGB_TO_DBM.values()))
+_NEXT_HIGHER = {value: next((v for v in _SORTED_DBM if v > value), MAX_COVERAGE)
+                for value in _SORTED_DBM}
+
+# Frozen array views of the palette for the vectorized paths; RGB_TO_DBM
+# stays the single source of truth and is kept for reference
+_PALETTE = np.array(list(RGB_TO_DBM.keys()), dtype=np.int16)
+_DBM = np.array(list(RGB_TO_DBM.values()), dtype=np.int8)
+
+# Every value the int8 pipeline can produce, rendered once; saves a str()
+# per row on the output path
+_DBM_STR = {value: str(value) for value in _SORTED_DBM}
+_DBM_STR[NO_COVERAGE] = "None"  # White / undefined pixels
+
+# Drop the two low-order bits of each channel when indexing the LUT, so the
+# table is 64^3 = 256 KiB and stays cache resident; the palette colors are
+# spaced widely enough that quantization cannot change the nearest match
+LUT_SHIFT = 2
+LUT_BINS = 256 >> LUT_SHIFT
+
+def nearest_dbm(pixels):
+    """Map an (N, 3) array of RGB values to their nearest palette dBm values"""
+    diff = pixels.astype(np.int16)[:, None, :] - _PALETTE[None, :, :]
+    # einsum fuses the square and sum into a single pass over the diffs; the
+    # accumulator must be wider than int16 since distances reach 3 * 255^2
+    d2 = np.einsum('nkc,nkc->nk', diff, diff, dtype=np.int32)
+    dbm = _DBM[d2.argmin(axis=1)]
+    # Pure white means no coverage / undefined RSRP
+    dbm[(pixels == 255).all(axis=1)] = NO_COVERAGE
+    return dbm
+
+def _build_lut():
+    """Build a flat 64^3 lookup table mapping quantized RGB to its nearest dBm value"""
+    # Use the centre of each quantization bin as the representative color
+    centers = (np.arange(LUT_BINS, dtype=np.int32) << LUT_SHIFT) + (1 << (LUT_SHIFT - 1))
+    grid = np.stack(np.meshgrid(centers, centers, centers, indexing='ij'), axis=-1).reshape(-1, 3)
+    return nearest_dbm(grid)
+
+# Quantized RGB -> dBm lookup table, built once at import
+RGB_DBM_LUT = _build_lut()
+
+def pack_rgb(bands):
+    """Pack (3, height, width) uint8 bands into one plane of 24-bit RGB values"""
+    return ((bands[0].astype(np.uint32) << 16)
+            | (bands[1].astype(np.uint32) << 8)
+            | bands[2])
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _packed_to_dbm_numba(pix, palette, dbm_values, out):
+        """Nearest-palette lookup compiled by Numba, parallelized across rows"""
+        for i in numba.prange(pix.size):
+            p = pix[i]
+            if p == WHITE:
+                out[i] = NO_COVERAGE
+                continue
+            r = np.int16((p >> 16) & 0xFF)
+            g = np.int16((p >> 8) & 0xFF)
+            b = np.int16(p & 0xFF)
+            best = 0
+            best_d2 = np.int32(3 * 255 * 255 + 1)
+            for k in range(palette.shape[0]):
+                d2 = ((r - palette[k, 0]) ** 2
+                      + (g - palette[k, 1]) ** 2
+                      + (b - palette[k, 2]) ** 2)
+                if d2 < best_d2:
+                    best_d2 = d2
+                    best = k
+            out[i] = dbm_values[best]
+
+def packed_to_dbm(pix):
+    """Map an (N,) packed-RGB batch to dBm values, using Numba when available"""
+    if numba is not None:
+        out = np.empty(pix.size, dtype=np.int8)
+        _packed_to_dbm_numba(np.ascontiguousarray(pix), _PALETTE, _DBM, out)
+        return out
+
+    # The LUT index needs only the top 6 bits of each packed channel
+    idx = ((pix & 0xFC0000) >> 6) | ((pix & 0xFC00) >> 4) | ((pix & 0xFC) >> 2)
+    dbm = RGB_DBM_LUT[idx]
+    # Quantization folds pure white into a shared bin, so flag it explicitly;
+    # one branchless compare against the packed value covers all three channels
+    return np.where(pix == WHITE, np.int8(NO_COVERAGE), dbm)
+
+def make_transformer(src_crs):
+    """Create a reusable WGS84 -> raster CRS transformer, or None when not needed"""
+    if src_crs is not None and src_crs.to_epsg() == 4326:
+        return None  # Raster already in WGS84; coordinates index it directly
+    return pyproj.Transformer.from_crs('EPSG:4326', src_crs, always_xy=True)
+
+def transform_coordinates(coordinates, transformer):
     """Transform latitude and longitude to raster file coordinate system"""
     lat, lon = map(float, coordinates.split(","))
-    x, y = rasterio.warp.transform({'init': 'EPSG:4326'}, src_crs, [lon], [lat])
-    return x[0], y[0]
+    if transformer is None:
+        return lon, lat
+    return transformer.transform(lon, lat)
 
 def get_pixel_location(coordinates, src):
     """Get pixel location corresponding to transformed coordinates"""
     return src.index(coordinates[0], coordinates[1])
 
-def get_rgb_values(pixel_location, src):
-    """Get RGB values at specified pixel location"""
-    red_band = src.read(1)
-    green_band = src.read(2)
-    blue_band = src.read(3)
-    red_value = red_band[pixel_location[0], pixel_location[1]]
-    green_value = green_band[pixel_location[0], pixel_location[1]]
-    blue_value = blue_band[pixel_location[0], pixel_location[1]]
-    return red_value, green_value, blue_value
-
-def get_closest_rgb(pixel_rgb):
-    """Find closest RGB value from known RGBs"""
-    if pixel_rgb == RGB_NO_COVERAGE:
-        return NO_COVERAGE  # Return 0 for white, indicating no coverage or undefined RSRP value
-
-    return min(RGB_TO_DBM.keys(), key=lambda x: sum((a-b)**2 for a, b in zip(x, pixel_rgb)))
-
-def interpolate_rsrp_value(min_rsrp, max_rsrp, min_val, max_val, current_val, method=None):
-    """Interpolate RSRP value between two known RSRP values based on current value"""
-    if min_val == max_val or method is None:
-        return min_rsrp  # No intermediate values or no interpolation method specified, return minimum RSRP
-    
-    if method == "linear":
-        return min_rsrp + (max_rsrp - min_rsrp) * ((current_val - min_val) / (max_val - min_val))
-    elif method == "average":
-        return (min_rsrp + max_rsrp) / 2  # Use average of the min and max RSRP values as interpolation
-    else:
-        raise ValueError("Invalid interpolation method. Supported methods are 'linear' and 'average'.")
-
-def get_coverage_level(coordinates, src, interpolation=None):
+def load_packed(src):
+    """Load the raster as a single packed-RGB plane if it fits in memory"""
+    if src.width * src.height * 4 > MAX_RASTER_BYTES:  # uint32 per pixel
+        return None
+    return pack_rgb(src.read())
+
+def get_packed_pixel(pixel_location, src, packed=None):
+    """Get packed RGB value at specified pixel location"""
+    row, col = pixel_location
+    if packed is None:
+        # Raster too large to cache; read a single pixel across all bands
+        pixel = src.read(window=Window(col, row, 1, 1))
+        return int(pack_rgb(pixel)[0, 0])
+    return int(packed[row, col])
+
+def _interp_linear(min_rsrp, max_rsrp, min_val, max_val, current_val):
+    """Interpolate RSRP linearly between two known RSRP values"""
+    if min_val == max_val:
+        return min_rsrp  # No intermediate values, return minimum RSRP
+    return min_rsrp + (max_rsrp - min_rsrp) * ((current_val - min_val) / (max_val - min_val))
+
+def _interp_average(min_rsrp, max_rsrp, min_val, max_val, current_val):
+    """Use the average of the min and max RSRP values as interpolation"""
+    return (min_rsrp + max_rsrp) / 2
+
+# Interpolation methods selectable from the command line; the chosen function
+# is bound once at startup so the hot path never compares method strings
+INTERPOLATION_METHODS = {"linear": _interp_linear, "average": _interp_average}
+
+def get_coverage_level(coordinates, src, interp_fn=None, packed=None, transformer=None):
     """Get coverage level at specified coordinates in the tif file"""
-    src_crs = src.crs
-    coordinates = transform_coordinates(coordinates, src_crs)
+    if transformer is None:
+        transformer = make_transformer(src.crs)
+    coordinates = transform_coordinates(coordinates, transformer)
     pixel_location = get_pixel_location(coordinates, src)
 
     # Check if transformed pixel coordinates are within raster bounds
@@ -80,91 +203,207 @@ def get_coverage_level(coordinates, src, interpolation=None):
         return None
 
     try:
-        # Get RGB values at specified location
-        pixel_rgb = get_rgb_values(pixel_location, src)
+        # Get packed RGB value at specified location
+        pixel = get_packed_pixel(pixel_location, src, packed)
 
-        # If 
-        if pixel_rgb == (255, 255, 255):
+        # Find the closest RGB match; the sentinel marks white / undefined pixels
+        closest_rsrp = int(packed_to_dbm(np.array([pixel], dtype=np.uint32))[0])
+        if closest_rsrp == NO_COVERAGE:
             return None
 
-        # Find the closest RGB match
-        closest_rgb = get_closest_rgb(pixel_rgb)
-
-        closest_rsrp = RGB_TO_DBM.get(closest_rgb, MIN_COVERAGE)
-
         if closest_rsrp == MAX_COVERAGE:
             return MAX_COVERAGE
 
         if closest_rsrp < MIN_COVERAGE:
             return MIN_COVERAGE
 
-        if interpolation:
-            # Interpolate RSRP value between closest and next closest RSRP values
-            min_rsrp = MAX_COVERAGE if closest_rsrp == MIN_COVERAGE else closest_rsrp
-            max_rsrp = MIN_COVERAGE
-            for rsrp in sorted(RGB_TO_DBM.values()):
-                if min_rsrp < rsrp < closest_rsrp:
-                    max_rsrp = rsrp
-                    break
-            interpolated_rsrp = interpolate_rsrp_value(min_rsrp, max_rsrp, RGB_TO_DBM[closest_rgb], max_rsrp, closest_rsrp, method=interpolation)
-            return interpolated_rsrp
+        if interp_fn is not None:
+            # Interpolate RSRP value between the closest and next higher buckets
+            next_rsrp = _NEXT_HIGHER[closest_rsrp]
+            return interp_fn(closest_rsrp, next_rsrp, closest_rsrp, next_rsrp, closest_rsrp)
 
         return closest_rsrp
     except (IndexError, KeyError, TypeError) as e:
         print(f"Error occurred while processing coordinates '{coordinates}': {e}")
         return None
 
-def process_row(row, src):
-    """Process single row from csv file"""
-    coordinates = [coord.strip() for coord in row[:2] if coord.strip()]
-    if len(coordinates) != 2:
-        print(f"Error: Coordinates not valid '{coordinates}'")
-        return None  # Skip processing if coordinates not valid
-
-    try:
-        # Check if coordinates can be converted to floats
-        coverage_level = get_coverage_level(",".join(coordinates), src)
-        if coverage_level is not None:
-            return coordinates + [coverage_level]
-        else:
-            return coordinates + ["NO_COVERAGE"]  # Special string to indicate no coverage
-    except ValueError:
-        pass  # Skip processing if coordinates are not valid floats
-    except Exception as e:
-        print(f"Error processing coordinates '{coordinates}': {e}")
-    return None
-
 def write_batch(rows, csv_writer):
     """Write a batch of rows to the CSV file."""
-    for row in rows:
-        if row is None:  # Check if row is None
-            csv_writer.writerow(["Null"] * 3)  # Write "Null" for all columns
-        elif row[2] == "NO_COVERAGE":  # Check if coverage level is NO_COVERAGE
-            csv_writer.writerow(row[:2] + ["None"])  # Write "None" for the RSRP column
-        else:
-            try:
-                csv_writer.writerow(row[:2] + [int(row[2])])  # Format RSRP as integer
-            except ValueError:
-                print(f"Error: Invalid RSRP value '{row[2]}'")
-
-def process_csv_chunk(chunk, src, progress_bar):
-    """Process chunk of rows from the CSV file"""
-    results = []
-    for row in chunk:
+    csv_writer.writerows(
+        ("Null", "Null", "Null") if row is None else row  # Null marks invalid coordinates
+        for row in rows
+    )
+
+def parse_chunk(chunk):
+    """Validate coordinates in a chunk of CSV rows"""
+    results = [None] * len(chunk)
+    parsed = []  # (chunk index, latitude string, longitude string)
+    lats, lons = [], []
+    for i, row in enumerate(chunk):
+        coordinates = [coord.strip() for coord in row[:2] if coord.strip()]
+        if len(coordinates) != 2:
+            print(f"Error: Coordinates not valid '{coordinates}'")
+            continue  # Skip processing if coordinates not valid
         try:
-            result = process_row(row, src)
-            if result is not None:
-                results.append(result)
-                progress_bar.update(1)
-            else:
-                results.append(None)  # Append None if process_row returns None
-                progress_bar.update(1)
-        except Exception as e:
-            print(f"Error processing row '{row}': {e}")
-            results.append(None)  # Append None if an error occurs during processing
-            progress_bar.update(1)
+            lat, lon = float(coordinates[0]), float(coordinates[1])
+        except ValueError:
+            continue  # Skip processing if coordinates are not valid floats
+        parsed.append((i, coordinates[0], coordinates[1]))
+        lats.append(lat)
+        lons.append(lon)
+    return results, parsed, lats, lons
+
+def locate_pixels(lats, lons, transformer, inv_transform, height, width):
+    """Transform a batch of coordinates to pixel indices with a bounds mask"""
+    if transformer is None:
+        xs, ys = lons, lats  # Raster is in WGS84, no reprojection needed
+    else:
+        # Transform the whole batch with a single call instead of one per row
+        xs, ys = transformer.transform(lons, lats)
+    # The inverse affine maps world coordinates straight to fractional pixel indices
+    float_cols, float_rows = inv_transform * (np.asarray(xs), np.asarray(ys))
+    rows = np.floor(float_rows).astype(np.int64)
+    cols = np.floor(float_cols).astype(np.int64)
+
+    # Mask out pixels that fall outside the raster bounds
+    in_bounds = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+    return rows, cols, in_bounds
+
+def make_block_reader(src):
+    """Create a reader for block-aligned windows that memoizes decoded tiles"""
+    block_h, block_w = src.block_shapes[0]
+
+    @functools.lru_cache(maxsize=BLOCK_CACHE_SIZE)
+    def read_block(block_row, block_col):
+        row_off = block_row * block_h
+        col_off = block_col * block_w
+        window = Window(col_off, row_off,
+                        min(block_w, src.width - col_off),
+                        min(block_h, src.height - row_off))
+        return pack_rgb(src.read(window=window))
+
+    return read_block
+
+def gather_pixels(rows, cols, in_bounds, src, packed, block_reader=None):
+    """Gather packed RGB values for the in-bounds pixels of a batch"""
+    pix = np.zeros(rows.size, dtype=np.uint32)
+    if not in_bounds.any():
+        return pix
+
+    if packed is not None:
+        # One load per pixel from the cached packed plane
+        pix[in_bounds] = packed[rows[in_bounds], cols[in_bounds]]
+        return pix
+
+    # Bucket pixels by raster block so every needed block is decoded at most
+    # once per batch, and spatially clustered batches hit the block cache
+    if block_reader is None:
+        block_reader = make_block_reader(src)
+    block_h, block_w = src.block_shapes[0]
+    blocks_per_row = (src.width + block_w - 1) // block_w
+    members = np.flatnonzero(in_bounds)
+    block_ids = (rows[members] // block_h) * blocks_per_row + cols[members] // block_w
+    for block_id in np.unique(block_ids):
+        in_block = members[block_ids == block_id]
+        block_row = int(block_id // blocks_per_row)
+        block_col = int(block_id % blocks_per_row)
+        tile = block_reader(block_row, block_col)
+        pix[in_block] = tile[rows[in_block] - block_row * block_h,
+                             cols[in_block] - block_col * block_w]
+    return pix
+
+def fill_results(results, parsed, in_bounds, dbm):
+    """Fill the results template from the batch's dBm values"""
+    dbm_values = dbm.tolist()  # One bulk conversion to Python ints
+    for n, (i, lat_str, lon_str) in enumerate(parsed):
+        if not in_bounds[n]:
+            print(f"Error: Coordinates '{lat_str},{lon_str}' are out of bounds.")
+            results[i] = (lat_str, lon_str, _DBM_STR[NO_COVERAGE])
+            continue
+        results[i] = (lat_str, lon_str, _DBM_STR[dbm_values[n]])
+
+def process_csv_chunk(chunk, src, packed=None, transformer=None, inv_transform=None,
+                      block_reader=None):
+    """Process chunk of rows from the CSV file"""
+    results, parsed, lats, lons = parse_chunk(chunk)
+    if parsed:
+        if transformer is None:
+            transformer = make_transformer(src.crs)
+        if inv_transform is None:
+            inv_transform = ~src.transform
+        rows, cols, in_bounds = locate_pixels(lats, lons, transformer, inv_transform,
+                                              src.height, src.width)
+        pix = gather_pixels(rows, cols, in_bounds, src, packed, block_reader)
+        dbm = packed_to_dbm(pix)
+        fill_results(results, parsed, in_bounds, dbm)
     return results
 
+# Worker-process state for --workers, populated by _init_worker
+_worker_shm = None
+_worker_packed = None
+
+def _init_worker(shm_name, shape, dtype):
+    """Attach a worker process to the shared packed-RGB plane"""
+    global _worker_shm, _worker_packed
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_packed = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+
+def _worker_lookup(rows, cols, in_bounds):
+    """Gather pixels from the shared plane and map them to dBm values"""
+    pix = gather_pixels(rows, cols, in_bounds, None, _worker_packed)
+    return packed_to_dbm(pix)
+
+def process_csv_parallel(csv_reader, csv_writer, packed, transformer, inv_transform,
+                         progress_bar, raw_csv_file, workers):
+    """Process the CSV with worker processes sharing the packed raster plane"""
+    height, width = packed.shape
+    shm = shared_memory.SharedMemory(create=True, size=packed.nbytes)
+    try:
+        shared_packed = np.ndarray(packed.shape, dtype=packed.dtype, buffer=shm.buf)
+        shared_packed[:] = packed
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, packed.shape, packed.dtype.name)) as executor:
+            pending = deque()  # Batches in flight, drained in submission order
+
+            def submit_chunk(chunk):
+                results, parsed, lats, lons = parse_chunk(chunk)
+                future = None
+                in_bounds = None
+                if parsed:
+                    rows, cols, in_bounds = locate_pixels(lats, lons, transformer,
+                                                          inv_transform, height, width)
+                    future = executor.submit(_worker_lookup, rows, cols, in_bounds)
+                pending.append((results, parsed, in_bounds, future))
+
+            def drain_one():
+                results, parsed, in_bounds, future = pending.popleft()
+                if future is not None:
+                    fill_results(results, parsed, in_bounds, future.result())
+                write_batch(results, csv_writer)
+
+            read_pos = 0
+            chunk = []
+            for row in csv_reader:
+                chunk.append(row)
+                if len(chunk) >= BATCH_SIZE:
+                    submit_chunk(chunk)
+                    chunk = []
+                    # Keep a bounded number of batches in flight
+                    while len(pending) > 2 * workers:
+                        drain_one()
+                    progress_bar.update(raw_csv_file.tell() - read_pos)
+                    read_pos = raw_csv_file.tell()
+
+            # Process remaining rows
+            if chunk:
+                submit_chunk(chunk)
+            while pending:
+                drain_one()
+            progress_bar.update(raw_csv_file.tell() - read_pos)
+    finally:
+        shm.close()
+        shm.unlink()
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Get coverage level at specified coordinates in a GeoTIFF file.")
@@ -173,6 +412,8 @@ def main():
     group.add_argument("--coordinates", "-c", help="Latitude and longitude coordinates separated by comma (e.g., '53.2716088,-6.2073869')")
     group.add_argument("--csv", "-f", help="Path to the CSV file")
     parser.add_argument("--interpolation", "-i", help="Interpolation method for RSRP values. Supported methods are 'linear' and 'average'. If not provided, no interpolation is performed.", choices=["linear", "average"])
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Number of worker processes for CSV processing. Requires the raster to fit in memory; defaults to single-process.")
+    parser.add_argument("--warped-vrt", action="store_true", help="Virtualize the raster into EPSG:4326 with a WarpedVRT so coordinates index it directly, skipping reprojection of every coordinate.")
     args = parser.parse_args()
 
     # Check if GeoTIFF file is accessible
@@ -188,11 +429,19 @@ def main():
     if not args.coordinates and not args.csv:
         parser.error("Either coordinates or a CSV file must be provided.")
 
+    # Bind the interpolation function once; argparse already validated the choice
+    interp_fn = INTERPOLATION_METHODS[args.interpolation] if args.interpolation else None
+
     if args.coordinates:
         coordinates = args.coordinates
         # Process single set of coordinates
-        with rasterio.open(args.geotiff) as src:
-            coverage_level = get_coverage_level(coordinates, src)
+        with rasterio.open(args.geotiff) as src_file, \
+                (WarpedVRT(src_file, crs='EPSG:4326', resampling=Resampling.nearest)
+                 if args.warped_vrt else nullcontext(src_file)) as src:
+            packed = load_packed(src)
+            transformer = make_transformer(src.crs)
+            coverage_level = get_coverage_level(coordinates, src, interp_fn=interp_fn,
+                                                packed=packed, transformer=transformer)
             if coverage_level is not None:
                 print(f"Coverage level at coordinates {coordinates}: {int(coverage_level)} dBm")
             elif coverage_level is None:
@@ -215,36 +464,54 @@ def main():
         
         # Create output CSV file
         output_file = os.path.splitext(args.csv)[0] + "_coverage_prediction.csv"
-        with rasterio.open(args.geotiff) as src:
-            with open(args.csv, 'r', encoding='utf-8') as csv_file:
+        with rasterio.open(args.geotiff) as src_file, \
+                (WarpedVRT(src_file, crs='EPSG:4326', resampling=Resampling.nearest)
+                 if args.warped_vrt else nullcontext(src_file)) as src:
+            packed = load_packed(src)
+            transformer = make_transformer(src.crs)
+            inv_transform = ~src.transform
+            block_reader = make_block_reader(src) if packed is None else None
+            if args.workers > 1 and packed is None:
+                print("Warning: Raster too large to share between workers. Falling back to a single process.")
+            with open(args.csv, 'rb', buffering=IO_BUFFER_BYTES) as raw_csv_file:
+                csv_file = io.TextIOWrapper(raw_csv_file, encoding='utf-8', newline='')
                 csv_reader = csv.reader(csv_file)
                 header = next(csv_reader)  # Read and skip header row
                 if [h.lower() for h in header[:2]] != ["latitude", "longitude"]:
                     print("Warning: The first row of the CSV does not contain 'Latitude' and 'Longitude' headers. Exiting...")
                     return
-                
-                # Create progress bar
-                total_rows = sum(1 for _ in csv_reader)  # Count total number of rows in CSV file
-                progress_bar = tqdm(total=total_rows, desc="Processing Rows", unit="row")
-                csv_file.seek(0)  # Reset file pointer
-                next(csv_reader)  # Skip header row
+
+                # Track progress by bytes consumed, so the file is read only once
+                progress_bar = tqdm(total=os.path.getsize(args.csv), desc="Processing Rows",
+                                    unit="B", unit_scale=True, unit_divisor=1024)
+                read_pos = 0
 
                 # Process CSV file in chunks
-                with open(output_file, 'w', newline='') as output_csv_file:
+                with open(output_file, 'w', newline='', buffering=IO_BUFFER_BYTES) as output_csv_file:
                     csv_writer = csv.writer(output_csv_file)
                     csv_writer.writerow(["Latitude", "Longitude", "RSRP"])  # Write header row
-                    chunk = []
-                    for row in csv_reader:
-                        chunk.append(row)
-                        if len(chunk) >= BATCH_SIZE:
-                            results = process_csv_chunk(chunk, src, progress_bar)
-                            write_batch(results, csv_writer)
-                            chunk = []
 
-                    # Process remaining rows
-                    if chunk:
-                        results = process_csv_chunk(chunk, src, progress_bar)
-                        write_batch(results, csv_writer)
+                    if args.workers > 1 and packed is not None:
+                        # Fan batches out across worker processes sharing the packed plane
+                        process_csv_parallel(csv_reader, csv_writer, packed, transformer,
+                                             inv_transform, progress_bar, raw_csv_file,
+                                             args.workers)
+                    else:
+                        chunk = []
+                        for row in csv_reader:
+                            chunk.append(row)
+                            if len(chunk) >= BATCH_SIZE:
+                                results = process_csv_chunk(chunk, src, packed, transformer, inv_transform, block_reader)
+                                write_batch(results, csv_writer)
+                                chunk = []
+                                progress_bar.update(raw_csv_file.tell() - read_pos)
+                                read_pos = raw_csv_file.tell()
+
+                        # Process remaining rows
+                        if chunk:
+                            results = process_csv_chunk(chunk, src, packed, transformer, inv_transform, block_reader)
+                            write_batch(results, csv_writer)
+                            progress_bar.update(raw_csv_file.tell() - read_pos)
 
                 # Close progress bar
                 progress_bar.close()